@@ -1,23 +1,48 @@
 # Import python packages
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from snowflake.snowpark.context import get_active_session
 from snowflake.snowpark import Session
+from snowflake.snowpark.exceptions import SnowparkSessionException
+from snowflake.connector.errors import InterfaceError, OperationalError
 import pandas as pd
-import hashlib
+import functools
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+# Search terms shorter than this are skipped; card IDs are Scryfall UUIDs, validated before querying
+MIN_SEARCH_TERM_LENGTH = 2
+CARD_ID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+# Snowflake error codes meaning the session itself is gone (session no longer exists / token expired)
+SESSION_LOST_ERROR_CODES = {390111, 390114}
 
 # Initialize session state for selected card ID
 if 'selected_card_id' not in st.session_state:
     st.session_state.selected_card_id = "ecc1027a-8c07-44a0-bdde-fa2844cff694"
 
-# Lazy connection - only connect when actually needed
+# Initialize session state for the last submitted search terms
+if 'search_terms' not in st.session_state:
+    st.session_state.search_terms = ("vivi", "final fantasy")
+
+# Sessions this app opened itself (and so may close), with a lock for swapping the shared session
+@st.cache_resource(show_spinner=False)
+def get_session_registry():
+    """Lock and set of app-opened sessions, shared across reruns like the session itself"""
+    return threading.Lock(), set()
+
+# Lazy connection - only connect when actually needed, then share across reruns and users
+@st.cache_resource(show_spinner=False)
 def get_snowflake_session():
-    """Create fresh Snowflake session only when needed"""
+    """Create Snowflake session once and reuse it"""
     try:
         session = get_active_session()
         # Test the connection with a simple query
         session.sql("SELECT 1").collect()
-        return session, "Connected using active Snowflake session"
+        return session
     except:
         try:
             connection_parameters = {
@@ -29,58 +54,196 @@ def get_snowflake_session():
                 "schema": st.secrets["snowflake"]["schema"]
             }
             session = Session.builder.configs(connection_parameters).create()
+            get_session_registry()[1].add(session)
             # Test the new connection
             session.sql("SELECT 1").collect()
-            return session, "Connected to Snowflake using credentials"
+            return session
         except Exception as e:
-            st.error(f"Failed to connect to Snowflake: {e}")
-            st.stop()
+            # Raise rather than st.stop(): in a worker thread st.stop() only requests a stop and
+            # returns, and cache_resource would then keep None as the session for good. An
+            # exception is never cached, so the next query tries to connect again
+            raise ConnectionError(f"Failed to connect to Snowflake: {e}") from e
+
+def is_connection_error(error):
+    """Check whether an error means the Snowflake session is unusable, rather than a bad query"""
+    if isinstance(error, (InterfaceError, OperationalError, SnowparkSessionException)):
+        return True
+    # Connector errors carry errno; Snowpark wraps them with sql_error_code
+    error_code = getattr(error, "sql_error_code", None) or getattr(error, "errno", None)
+    return error_code in SESSION_LOST_ERROR_CODES
+
+def reset_snowflake_session(session):
+    """Drop a session that lost its connection, closing it if this app opened it"""
+    lock, owned_sessions = get_session_registry()
+    with lock:
+        # Another worker may already have replaced the shared session
+        if get_snowflake_session() is not session:
+            return
+        get_snowflake_session.clear()
+        if session in owned_sessions:
+            owned_sessions.discard(session)
+            try:
+                session.close()
+            except Exception:
+                # The connection is already broken; there is nothing left to release
+                pass
+
+def is_valid_card_id(card_id):
+    """Check that a card ID looks like a UUID before sending it to Snowflake"""
+    return bool(CARD_ID_PATTERN.match(card_id.strip()))
 
-def execute_query_with_retry(query, max_retries=2):
-    """Execute query with automatic retry on connection failure"""
+def normalize_search_term(term):
+    """Collapse whitespace and lowercase so equivalent searches share a cache entry"""
+    return re.sub(r'\s+', ' ', term).strip().lower()
+
+def current_cache_date():
+    """UTC date passed to cached functions so persisted cache entries roll over daily"""
+    return datetime.now(timezone.utc).date().isoformat()
+
+def execute_query_with_retry(query, params=None, max_retries=2):
+    """Execute query with bind parameters and automatic retry on connection failure"""
     for attempt in range(max_retries + 1):
+        session = None
         try:
-            session, _ = get_snowflake_session()
-            result = session.sql(query)
-            return result.to_pandas()
+            session = get_snowflake_session()
+            result = session.sql(query, params=params)
+            # Go through Arrow so columns stay pyarrow-backed instead of Python objects. A single
+            # to_arrow() is enough: the connector's prefetch threads already download result chunks
+            # in parallel, and it keeps the typed (column-bearing) frame for empty results
+            return result.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
         except Exception as e:
             if attempt == max_retries:
-                st.error(f"Query failed after {max_retries + 1} attempts: {str(e)}")
-                return pd.DataFrame()
+                # Raise rather than return an empty frame so the failure never gets cached
+                raise
+            # Only a lost connection warrants reconnecting; query errors keep the shared session
+            if session is not None and is_connection_error(e):
+                reset_snowflake_session(session)
             time.sleep(1)
 
-# Cache card search results for 24 hours (card database is relatively static)
-@st.cache_data(ttl=86400)  # Cache for 24 hours
-def search_cards(search_term1, search_term2):
+def run_queries_in_parallel(*calls):
+    """Run (func, *args) query calls concurrently so their Snowflake round-trips overlap"""
+    ctx = get_script_run_ctx()
+
+    def run(func, *args):
+        # Attach the script context so cached functions and st.error work in worker threads
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(run, *call) for call in calls]
+        return [future.result() for future in futures]
+
+def report_query_errors(error_message, empty_result):
+    """Show failures of a cached query and return empty_result() instead, outside the cache"""
+    def decorator(cached_func):
+        @functools.wraps(cached_func, updated=())
+        def wrapper(*args):
+            try:
+                return cached_func(*args)
+            except Exception as e:
+                # The exception escaped the cached function, so nothing was stored and the next run retries
+                st.error(f"{error_message}: {str(e)}")
+                return empty_result()
+        wrapper.clear = cached_func.clear
+        return wrapper
+    return decorator
+
+# Cached functions persist to disk so results survive container restarts. Streamlit ignores
+# ttl on persisted caches, so each takes cache_date to key entries by day, and
+# expire_persisted_caches() deletes earlier days' entries. max_entries bounds memory within a day.
+# Spinners are disabled because the call sites show their own (and may run in worker threads).
+
+# Cache card search results for the day (card database is relatively static)
+@report_query_errors("Error searching cards", pd.DataFrame)
+@st.cache_data(persist="disk", show_spinner=False, max_entries=500)
+def search_cards(search_term1, search_term2, cache_date):
     """Search for cards and cache results"""
-    try:
-        search_query = f"SELECT * FROM TABLE(MTG_COST.PUBLIC.GET_CARD_ID('{search_term1}', '{search_term2}')) LIMIT 1000"
-        return execute_query_with_retry(search_query)
-    except Exception as e:
-        st.error(f"Error searching cards: {str(e)}")
-        return pd.DataFrame()
-
-# Cache price data for 24 hours (prices only update once per day)
-@st.cache_data(ttl=86400)  # Cache for 24 hours
-def get_card_prices(card_id):
-    """Get card price data and cache results"""
-    try:
-        query = f"SELECT * FROM TABLE(MTG_COST.PUBLIC.GET_CARD_PRICES('{card_id}'))"
-        return execute_query_with_retry(query)
-    except Exception as e:
-        st.error(f"Error querying data: {str(e)}")
-        return pd.DataFrame()
-
-# Cache view data for 24 hours
-@st.cache_data(ttl=86400)  # Cache for 24 hours
-def get_price_after_launch():
-    """Get price after launch data and cache results"""
-    try:
-        query = "SELECT * FROM price_after_launch"
-        return execute_query_with_retry(query)
-    except Exception as e:
-        st.error(f"Error querying price after launch data: {str(e)}")
-        return pd.DataFrame()
+    # Select only the displayed columns, already in display order
+    search_query = """
+        SELECT
+            NAME, TCGPLAYER_URL, SET_NAME, ID,
+            AVG_PRICE, MIN_PRICE, MAX_PRICE,
+            AVG_FOIL_PRICE, MIN_FOIL_PRICE, MAX_FOIL_PRICE,
+            PRICE_RECORDS_COUNT
+        FROM TABLE(MTG_COST.PUBLIC.GET_CARD_ID(?, ?))
+        LIMIT 1000
+    """
+    return execute_query_with_retry(search_query, params=[search_term1, search_term2])
+
+# Cache price data for the day (prices only update once per day)
+@report_query_errors("Error querying data", lambda: (pd.DataFrame(), pd.DataFrame()))
+@st.cache_data(persist="disk", show_spinner=False, max_entries=500)
+def get_card_prices(card_id, cache_date):
+    """Get card price history plus its chart-ready frame and cache both"""
+    # Cast server-side so PULL_DATE arrives as an Arrow timestamp rather than a date/string
+    query = """
+        SELECT PULL_DATE::TIMESTAMP_NTZ AS PULL_DATE, USD, USD_FOIL
+        FROM TABLE(MTG_COST.PUBLIC.GET_CARD_PRICES(?))
+        ORDER BY PULL_DATE
+    """
+    df = execute_query_with_retry(query, params=[card_id])
+    if df.empty:
+        return df, pd.DataFrame()
+    
+    # Convert PULL_DATE to datetime only if it's not already
+    if not pd.api.types.is_datetime64_any_dtype(df['PULL_DATE']):
+        df['PULL_DATE'] = pd.to_datetime(df['PULL_DATE'])
+    
+    # Prepare data for chart, removing rows where both prices are null
+    chart_data = df.set_index('PULL_DATE')[['USD', 'USD_FOIL']].rename(columns={
+        'USD': 'Regular Price',
+        'USD_FOIL': 'Foil Price'
+    }).dropna(how='all')
+    return df, chart_data
+
+# Cache price statistics for the day (aggregated server-side, returns a single row)
+@report_query_errors("Error querying price statistics", pd.DataFrame)
+@st.cache_data(persist="disk", show_spinner=False, max_entries=500)
+def get_card_stats(card_id, cache_date):
+    """Get summary price statistics for a card and cache results"""
+    query = """
+        SELECT
+            MAX_BY(USD, PULL_DATE) AS LATEST_USD,
+            MAX_BY(USD_FOIL, PULL_DATE) AS LATEST_USD_FOIL,
+            MAX(PULL_DATE) AS LAST_UPDATED,
+            AVG(USD) AS AVG_USD,
+            MIN(USD) AS MIN_USD,
+            MAX(USD) AS MAX_USD,
+            COUNT(USD) AS COUNT_USD,
+            AVG(USD_FOIL) AS AVG_USD_FOIL,
+            MIN(USD_FOIL) AS MIN_USD_FOIL,
+            MAX(USD_FOIL) AS MAX_USD_FOIL,
+            COUNT(USD_FOIL) AS COUNT_USD_FOIL
+        FROM TABLE(MTG_COST.PUBLIC.GET_CARD_PRICES(?))
+    """
+    return execute_query_with_retry(query, params=[card_id])
+
+# Cache view data for the day
+@report_query_errors("Error querying price after launch data", lambda: (pd.DataFrame(), pd.DataFrame()))
+@st.cache_data(persist="disk", show_spinner=False, max_entries=1)
+def get_price_after_launch(cache_date):
+    """Get price after launch data plus its chart-ready pivot and cache both"""
+    query = "SELECT * FROM price_after_launch"
+    launch_df = execute_query_with_retry(query)
+    if launch_df.empty:
+        return launch_df, pd.DataFrame()
+    
+    # Pivot to get sets as separate series, sorted by date_diff for proper line chart
+    chart_data = launch_df.pivot(index='DATE_DIFF', columns='SET_NAME', values='AVG_USD').sort_index()
+    return launch_df, chart_data
+
+# Persisted next to the query caches, so after a restart it still says which day they were filled
+@st.cache_data(persist="disk", show_spinner=False)
+def get_persisted_cache_date():
+    """Date the persisted query caches were filled on"""
+    return current_cache_date()
+
+def expire_persisted_caches(cache_date):
+    """Delete earlier days' cached entries, in memory and on disk, once the UTC date rolls over"""
+    if get_persisted_cache_date() != cache_date:
+        for cached_func in (search_cards, get_card_prices, get_card_stats, get_price_after_launch, get_persisted_cache_date):
+            cached_func.clear()
+        get_persisted_cache_date()
 
 # Write directly to the app
 st.title("MTG Card Price Tracker 🃏")
@@ -94,65 +257,65 @@ st.write(
 with st.expander("ℹ️ Cache Information"):
     st.write("""
     **Caching Strategy:**
-    - Card searches: Cached for 24 hours
-    - Price data: Cached for 24 hours (updates once daily)
-    - Sessions: Fresh connections on-demand
+    - Card searches: Cached for the day, persisted across app restarts
+    - Price data: Cached for the day, persisted across app restarts (updates once daily)
+    - Sessions: Reused across reruns, reconnected on failure
     
     This minimizes Snowflake compute costs while ensuring reliability.
     """)
 
+# Shared by all cached queries this run so entries expire at the UTC date boundary
+cache_date = current_cache_date()
+expire_persisted_caches(cache_date)
+
 # Card Search Section
 st.subheader("🔍 Find Card ID")
 st.write("Search for cards to get their UUID for price tracking")
 
-col1, col2 = st.columns(2)
-with col1:
-    search_term1_raw = st.text_input(
-        "Card Name", 
-        value="vivi",
-        help="Enter part of the card name"
-    )
-    search_term1 = search_term1_raw.lower()
+# Inputs live in a form so typing doesn't rerun the search on every keystroke
+with st.form("search_form"):
+    col1, col2 = st.columns(2)
+    with col1:
+        search_term1_raw = st.text_input(
+            "Card Name", 
+            value=st.session_state.search_terms[0],
+            help="Enter part of the card name"
+        )
+    
+    with col2:
+        search_term2_raw = st.text_input(
+            "Set Name", 
+            value=st.session_state.search_terms[1],
+            help="Enter additional search criteria"
+        )
+    
+    submitted = st.form_submit_button("Search Cards")
 
-with col2:
-    search_term2_raw = st.text_input(
-        "Set Name", 
-        value="final fantasy",
-        help="Enter additional search criteria"
+# Only update the search terms on submit; other reruns reuse the last submitted search
+if submitted:
+    st.session_state.search_terms = (
+        normalize_search_term(search_term1_raw),
+        normalize_search_term(search_term2_raw)
     )
-    search_term2 = search_term2_raw.lower()
+search_term1, search_term2 = st.session_state.search_terms
 
 # Add cache control
-col1, col2 = st.columns([3, 1])
-with col1:
-    search_button = st.button("Search Cards")
-with col2:
-    if st.button("🔄 Clear Cache"):
-        st.cache_data.clear()
-        st.success("Cache cleared!")
-        st.rerun()
-
-if search_button or (search_term1 and search_term2):
-    # Show cache status
-    cache_key = f"{search_term1}_{search_term2}"
-    
+if st.button("🔄 Clear Cache"):
+    st.cache_data.clear()
+    st.success("Cache cleared!")
+    st.rerun()
+
+# Skip the round-trip (and the cache entry) for terms too short to be useful
+if len(search_term1) < MIN_SEARCH_TERM_LENGTH or len(search_term2) < MIN_SEARCH_TERM_LENGTH:
+    st.info(f"Enter at least {MIN_SEARCH_TERM_LENGTH} characters for both Card Name and Set Name to search.")
+
+else:
     with st.spinner("Searching for cards..."):
-        search_df = search_cards(search_term1, search_term2)
+        search_df = search_cards(search_term1, search_term2, cache_date)
         
     if not search_df.empty:
         st.write(f"Found {len(search_df)} cards:")
         
-        # Reorder columns for better display
-        column_order = [
-            'NAME', 'TCGPLAYER_URL', 'SET_NAME', 'ID', 
-            'AVG_PRICE', 'MIN_PRICE', 'MAX_PRICE', 
-            'AVG_FOIL_PRICE', 'MIN_FOIL_PRICE', 'MAX_FOIL_PRICE', 
-            'PRICE_RECORDS_COUNT'
-        ]
-        
-        # Reorder the dataframe columns
-        search_df_ordered = search_df[column_order]
-        
         # Configure column display with clickable URLs
         column_config = {
             "TCGPLAYER_URL": st.column_config.LinkColumn(
@@ -164,7 +327,7 @@ if search_button or (search_term1 and search_term2):
         
         # Make the dataframe interactive with clickable URLs and selection
         event = st.dataframe(
-            search_df_ordered, 
+            search_df, 
             use_container_width=True,
             column_config=column_config,
             on_select="rerun",
@@ -174,7 +337,7 @@ if search_button or (search_term1 and search_term2):
         # Handle row selection to populate card ID
         if len(event.selection.rows) > 0:
             selected_row = event.selection.rows[0]
-            selected_card_id = search_df_ordered.iloc[selected_row]['ID']
+            selected_card_id = search_df.iloc[selected_row]['ID']
             if st.session_state.selected_card_id != selected_card_id:
                 st.session_state.selected_card_id = selected_card_id
                 st.success(f"✅ Selected card ID: {selected_card_id}")
@@ -190,6 +353,9 @@ st.divider()  # Visual separator
 # Price Tracking Section
 st.subheader("📈 Card Price Tracker")
 
+# Populated by the price tracker when it prefetches alongside the card queries
+launch_df = None
+
 # Card ID input - now uses session state for selected card
 card_id = st.text_input(
     "Card ID", 
@@ -202,65 +368,77 @@ card_id = st.text_input(
 if card_id != st.session_state.selected_card_id:
     st.session_state.selected_card_id = card_id
 
-if card_id:
+if card_id and not is_valid_card_id(card_id):
+    st.error("Card ID must be a UUID (e.g. ecc1027a-8c07-44a0-bdde-fa2844cff694).")
+
+elif card_id:
+    card_id = card_id.strip()
+    # The full history is only fetched once the user asks for it. The toggle is rendered further
+    # down, so read its state here; Streamlit has already stored the value the user just set
+    show_price_history = st.session_state.get("show_price_history", False)
+    
     with st.spinner("Loading price data..."):
-        df = get_card_prices(card_id)
+        # Fetch the launch analysis alongside the card data to save a round-trip on cold loads
+        calls = [(get_card_stats, card_id, cache_date), (get_price_after_launch, cache_date)]
+        if show_price_history:
+            calls.append((get_card_prices, card_id, cache_date))
+        stats_df, (launch_df, launch_chart_data), *history = run_queries_in_parallel(*calls)
     
-    if not df.empty:
-        # Convert PULL_DATE to datetime if it's not already
-        df['PULL_DATE'] = pd.to_datetime(df['PULL_DATE'])
-        
-        # Sort by date for proper line chart
-        df = df.sort_values('PULL_DATE')
+    if not stats_df.empty and pd.notna(stats_df.iloc[0]['LAST_UPDATED']):
+        stats = stats_df.iloc[0]
         
         # Display current prices
-        latest_data = df.iloc[-1]
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.metric(
                 "Latest Regular Price", 
-                f"${latest_data['USD']:.2f}" if pd.notna(latest_data['USD']) else "N/A"
+                f"${stats['LATEST_USD']:.2f}" if pd.notna(stats['LATEST_USD']) else "N/A"
             )
         
         with col2:
             st.metric(
                 "Latest Foil Price", 
-                f"${latest_data['USD_FOIL']:.2f}" if pd.notna(latest_data['USD_FOIL']) else "N/A"
+                f"${stats['LATEST_USD_FOIL']:.2f}" if pd.notna(stats['LATEST_USD_FOIL']) else "N/A"
             )
         
         with col3:
             st.metric(
                 "Last Updated", 
-                latest_data['PULL_DATE'].strftime('%Y-%m-%d')
+                pd.to_datetime(stats['LAST_UPDATED']).strftime('%Y-%m-%d')
             )
         
         # Price trend chart
         st.subheader("Price Trends Over Time")
         
-        # Prepare data for chart
-        chart_data = df.set_index('PULL_DATE')[['USD', 'USD_FOIL']].rename(columns={
-            'USD': 'Regular Price',
-            'USD_FOIL': 'Foil Price'
-        })
-        
-        # Remove rows where both prices are null
-        chart_data = chart_data.dropna(how='all')
-        
-        if not chart_data.empty:
-            st.line_chart(chart_data)
-        else:
-            st.warning("No price data available for charting.")
+        st.toggle(
+            "Load price history",
+            key="show_price_history",
+            help="Fetch the full daily price history for the chart and data table"
+        )
         
-        # Raw data table
-        with st.expander("📊 Price History Data"):
-            # Format the dataframe for display
-            display_df = df.copy()
-            display_df['PULL_DATE'] = display_df['PULL_DATE'].dt.strftime('%Y-%m-%d')
-            display_df['USD'] = display_df['USD'].apply(lambda x: f"${x:.2f}" if pd.notna(x) else "N/A")
-            display_df['USD_FOIL'] = display_df['USD_FOIL'].apply(lambda x: f"${x:.2f}" if pd.notna(x) else "N/A")
+        if history:
+            df, chart_data = history[0]
+            
+            if not chart_data.empty:
+                st.line_chart(chart_data)
+            else:
+                st.warning("No price data available for charting.")
             
-            st.dataframe(display_df, use_container_width=True)
+            # Raw data table - only formatted and rendered when the user asks for it
+            if st.toggle("📊 Show Price History Data", key="show_history"):
+                # Format the dataframe for display (Styler formats in place, no copy needed)
+                display_df = df.style.format(
+                    {
+                        'PULL_DATE': '{:%Y-%m-%d}',
+                        'USD': '${:.2f}',
+                        'USD_FOIL': '${:.2f}'
+                    },
+                    subset=['PULL_DATE', 'USD', 'USD_FOIL'],
+                    na_rep="N/A"
+                )
+                
+                st.dataframe(display_df, use_container_width=True)
         
         # Summary statistics
         st.subheader("Price Statistics")
@@ -268,23 +446,21 @@ if card_id:
         
         with col1:
             st.write("**Regular Card Statistics:**")
-            regular_prices = df['USD'].dropna()
-            if not regular_prices.empty:
-                st.write(f"- Average: ${regular_prices.mean():.2f}")
-                st.write(f"- Minimum: ${regular_prices.min():.2f}")
-                st.write(f"- Maximum: ${regular_prices.max():.2f}")
-                st.write(f"- Data Points: {len(regular_prices)}")
+            if stats['COUNT_USD'] > 0:
+                st.write(f"- Average: ${stats['AVG_USD']:.2f}")
+                st.write(f"- Minimum: ${stats['MIN_USD']:.2f}")
+                st.write(f"- Maximum: ${stats['MAX_USD']:.2f}")
+                st.write(f"- Data Points: {stats['COUNT_USD']}")
             else:
                 st.write("No regular price data available")
         
         with col2:
             st.write("**Foil Card Statistics:**")
-            foil_prices = df['USD_FOIL'].dropna()
-            if not foil_prices.empty:
-                st.write(f"- Average: ${foil_prices.mean():.2f}")
-                st.write(f"- Minimum: ${foil_prices.min():.2f}")
-                st.write(f"- Maximum: ${foil_prices.max():.2f}")
-                st.write(f"- Data Points: {len(foil_prices)}")
+            if stats['COUNT_USD_FOIL'] > 0:
+                st.write(f"- Average: ${stats['AVG_USD_FOIL']:.2f}")
+                st.write(f"- Minimum: ${stats['MIN_USD_FOIL']:.2f}")
+                st.write(f"- Maximum: ${stats['MAX_USD_FOIL']:.2f}")
+                st.write(f"- Data Points: {stats['COUNT_USD_FOIL']}")
             else:
                 st.write("No foil price data available")
     
@@ -300,18 +476,13 @@ st.divider()  # Visual separator
 st.subheader("📊 Average Price of Mythic and Rare Cards Per Set")
 st.write("Track how card prices evolve over the first 300 days after set release")
 
-with st.spinner("Loading price analysis data..."):
-    launch_df = get_price_after_launch()
+if launch_df is None:
+    with st.spinner("Loading price analysis data..."):
+        launch_df, launch_chart_data = get_price_after_launch(cache_date)
 
 if not launch_df.empty:
-    # Prepare data for chart (pivot to get sets as separate series)
-    chart_data = launch_df.pivot(index='DATE_DIFF', columns='SET_NAME', values='AVG_USD')
-    
-    # Sort by date_diff for proper line chart
-    chart_data = chart_data.sort_index()
-    
-    # Create the line chart
-    st.line_chart(chart_data, x_label="Days After Launch", y_label="Average USD")
+    # Create the line chart from the cached pivot
+    st.line_chart(launch_chart_data, x_label="Days After Launch", y_label="Average USD")
     
     # Show summary statistics
     with st.expander("📈 Price Analysis Summary"):
@@ -319,10 +490,9 @@ if not launch_df.empty:
         
         with col1:
             st.write("**Sets Tracked:**")
-            sets = launch_df['SET_NAME'].unique()
-            for set_name in sorted(sets):
-                set_data = launch_df[launch_df['SET_NAME'] == set_name]
-                avg_price = set_data['AVG_USD'].mean()
+            # Single groupby pass instead of re-filtering the frame once per set
+            per_set = launch_df.groupby('SET_NAME', sort=True)['AVG_USD'].mean()
+            for set_name, avg_price in per_set.items():
                 st.write(f"- {set_name}: ${avg_price:.2f} avg")
         
         with col2:
@@ -330,11 +500,11 @@ if not launch_df.empty:
             st.write(f"- Total data points: {len(launch_df):,}")
             st.write(f"- Date range: 1-300 days after release")
             st.write(f"- Card types: Mythic & Rare only")
-            st.write(f"- Sets: {len(sets)} expansion sets")
+            st.write(f"- Sets: {len(per_set)} expansion sets")
 
 else:
     st.warning("No price after launch data available.")
 
 # Footer with cache info
 st.markdown("---")
-st.caption("💡 Data cached for 24 hours to minimize costs. Prices update once daily in the database.")
\ No newline at end of file
+st.caption("💡 Data cached daily (and persisted to disk) to minimize costs. Prices update once daily in the database.")
\ No newline at end of file